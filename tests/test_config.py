@@ -72,6 +72,7 @@ def args():
         no_history=False,
         history_file="/tests/tmp/new_history.log",
         force_download=True,
+        max_worker=0,
         min_scroll=1500,
         max_scroll=2500,
         dry_run=True,
@@ -117,6 +118,7 @@ def test_load_from_args(default_config, args):
     assert static_config.no_history is False
     assert static_config.download_dir == Path("/tests/tmp/downloads")
     assert static_config.force_download is True
+    assert static_config.max_worker == 0
     assert static_config.dry_run is True
     assert static_config.terminate is True
     assert static_config.chrome_args == ["--headless", "--disable-gpu"]
@@ -130,6 +132,16 @@ def test_load_from_args(default_config, args):
     assert path_config.history_file == "/tests/tmp/new_history.log"
 
 
+def test_load_from_args_keeps_yaml_max_worker(default_config, args):
+    args.max_worker = None
+    config_manager = ConfigManager(default_config=default_config)
+    config_manager.load_from_defaults()
+    config_manager.set("static_config", "max_worker", 8)
+    config_manager.load_from_args(args)
+
+    assert config_manager.create_static_config().max_worker == 8
+
+
 @pytest.fixture
 def yaml_config_content():
     return """
@@ -4,6 +4,7 @@ import os
 import shutil
 import logging
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -15,6 +16,7 @@ from v2dl.utils import DownloadLogKeys as LogKey, DownloadStatus
 from v2dl.web_bot import get_bot
 
 TEST_ALBUM_URL = "http://example.com/album"
+VALID_EXT = frozenset(f".{ext.lower()}" for ext in VALID_EXTENSIONS)
 
 
 @pytest.fixture
@@ -38,32 +40,52 @@ def setup_test_env(tmp_path, real_config):
 
 @pytest.fixture
 def mock_runtime_config():
-    runtime_config = MagicMock()
-    runtime_config.url = TEST_ALBUM_URL
-    runtime_config.language = "en"
-    runtime_config.dry_run = False
-    runtime_config.logger = logging.getLogger()
-    runtime_config.download_service = MagicMock()
-    runtime_config.download_function = MagicMock()
-    runtime_config.url_file = None
-    runtime_config.force_download = False
-    runtime_config.log_level = logging.DEBUG
-    return runtime_config
+    return SimpleNamespace(
+        url=TEST_ALBUM_URL,
+        language="en",
+        dry_run=False,
+        logger=logging.getLogger(),
+        download_service=MagicMock(),
+        download_function=MagicMock(),
+        url_file=None,
+        force_download=False,
+        log_level=logging.DEBUG,
+    )
+
+
+@pytest.fixture(scope="module")
+def mock_static_config():
+    # read-only in the tests, share it across the module
+    return SimpleNamespace(
+        dry_run=False,
+        terminate=True,
+        language="ja",
+        force_download=False,
+        exact_dir=False,
+    )
 
 
 @pytest.fixture
-def mock_config(tmp_path):
-    config = MagicMock()
-    config.paths.download_log = tmp_path / "mock_log_path"
-    return config
+def mock_config(tmp_path, mock_logger, mock_static_config):
+    return SimpleNamespace(
+        static_config=mock_static_config,
+        runtime_config=SimpleNamespace(
+            url=TEST_ALBUM_URL,
+            url_file=None,
+            logger=mock_logger,
+            download_service=MagicMock(),
+            download_function=MagicMock(),
+        ),
+        path_config=SimpleNamespace(download_log=str(tmp_path / "mock_log_path")),
+    )
 
 
 @pytest.fixture
 def mock_web_bot():
-    web_bot = MagicMock()
-    web_bot.close_driver = MagicMock()
-    web_bot.auto_page_scroll = MagicMock(return_value="<html></html>")
-    return web_bot
+    return SimpleNamespace(
+        close_driver=MagicMock(),
+        auto_page_scroll=lambda *args, **kwargs: "<html></html>",
+    )
 
 
 @pytest.fixture
@@ -81,7 +103,6 @@ def test_download(setup_test_env, real_args):
     scraper: ScrapeHandler
     config: Config
     runtime_config: RuntimeConfig
-    valid_extensions = VALID_EXTENSIONS
 
     scraper, config = setup_test_env()
     runtime_config = config.runtime_config
@@ -97,8 +118,11 @@ def test_download(setup_test_env, real_args):
     assert download_subdir.is_dir(), "Expected a directory but found a file"
 
     # Check number of files
-    image_files = sorted(download_subdir.glob("*"), key=lambda x: x.name)
-    image_files = [f for f in image_files if f.suffix.lower()[1:] in valid_extensions]
+    with os.scandir(download_subdir) as it:
+        image_files = sorted(
+            (e for e in it if os.path.splitext(e.name)[1].lower() in VALID_EXT),
+            key=lambda e: e.name,
+        )
     assert len(image_files) == expected_file_count, (
         f"Expected {expected_file_count} images, found {len(image_files)}"
     )
@@ -106,7 +130,7 @@ def test_download(setup_test_env, real_args):
     # Check file names match 001, 002, 003...
     for idx, image_file in enumerate(image_files, start=1):
         expected_filename = f"{idx:03d}"
-        actual_filename = image_file.stem
+        actual_filename = os.path.splitext(image_file.name)[0]
         assert expected_filename == actual_filename, (
             f"Expected file name {expected_filename}, found {actual_filename}"
         )
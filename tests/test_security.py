@@ -1,17 +1,22 @@
 import os
+import json
 import atexit
 import base64
 import shutil
 import logging
 import secrets
 from datetime import datetime, timedelta
+from unittest.mock import Mock
 
+import yaml
 import pytest
 from nacl.public import PrivateKey
+from nacl.secret import SecretBox
 
 from v2dl.common import SecurityError
 from v2dl.config import EncryptionConfig
-from v2dl.utils import AccountManager, Encryptor, KeyManager
+from v2dl.utils import AccountManager, Encryptor, KeyManager, SecureFileHandler
+from v2dl.utils.security import cleanup
 
 
 @pytest.fixture
@@ -39,17 +44,48 @@ def encryptor(encryption_config, logger):
 
 def test_master_key_decryption(encryptor: Encryptor):
     master_key = secrets.token_bytes(32)
-    encrypted_key, salt, encryption_key = encryptor.encrypt_master_key(master_key)
+    encrypted_key, encryption_key = encryptor.encrypt_master_key(master_key)
 
     decrypted_key = encryptor.decrypt_master_key(
         encrypted_master_key=encrypted_key,
-        salt=base64.b64encode(salt).decode("utf-8"),
         encryption_key=base64.b64encode(encryption_key).decode("utf-8"),
     )
 
     assert decrypted_key == master_key, "master key decryption error"
 
 
+def test_legacy_master_key_decryption(encryptor: Encryptor):
+    master_key = secrets.token_bytes(32)
+    salt = secrets.token_bytes(16)
+    encryption_key = secrets.token_bytes(32)
+    derived_key = encryptor.derive_key(encryption_key, salt)
+    encrypted_key = SecretBox(derived_key).encrypt(master_key)
+
+    decrypted_key = encryptor.decrypt_master_key(
+        encrypted_master_key=encrypted_key,
+        encryption_key=base64.b64encode(encryption_key).decode("utf-8"),
+        salt=base64.b64encode(salt).decode("utf-8"),
+    )
+
+    assert decrypted_key == master_key, "legacy master key decryption error"
+
+
+def test_derive_key_cache(encryptor: Encryptor):
+    salt = secrets.token_bytes(16)
+    encryption_key = secrets.token_bytes(32)
+    assert not encryptor._atexit_registered
+
+    derived_key = encryptor.derive_key(encryption_key, salt)
+    assert (salt, encryption_key) in encryptor._kdf_cache
+    assert encryptor._atexit_registered
+    assert encryptor.derive_key(encryption_key, salt) == derived_key
+
+    encryptor.clear_kdf_cache()
+    assert not encryptor._kdf_cache
+    assert encryptor.derive_key(encryption_key, salt) == derived_key
+    atexit.unregister(encryptor.clear_kdf_cache)
+
+
 def test_keypair(encryptor: Encryptor):
     test_message = "test message."
 
@@ -83,14 +119,14 @@ def account_manager(encryption_config, logger, tmp_path):
         "private_key_file": str(tmp_path / ".keys" / "private_key.pem"),
         "public_key_file": str(tmp_path / ".keys" / "public_key.pem"),
     }
-    yaml_path = str(tmp_path / "accounts.yaml")
+    account_path = str(tmp_path / "accounts.json")
 
     key_manager = KeyManager(logger, encryption_config, path_config)
-    account_manager_instance = AccountManager(logger, key_manager, yaml_path)
+    account_manager_instance = AccountManager(logger, key_manager, account_path)
 
     yield account_manager_instance
 
-    atexit.unregister(account_manager_instance._save_yaml)
+    atexit.unregister(account_manager_instance.flush)
     if os.name != "nt":
         shutil.rmtree(tmp_path)
 
@@ -168,6 +204,45 @@ def test_verify_password(account_manager: AccountManager):
     assert account_manager.verify_password(username, "wrong_password", private_key) is False
 
 
+def test_password_cache_invalidated_on_edit(account_manager: AccountManager):
+    username = "test_user"
+    private_key = PrivateKey.generate()
+    public_key = private_key.public_key
+
+    account_manager.create(username, "old_password", "", public_key)
+    assert account_manager.get_pw(username, private_key) == "old_password"
+
+    account_manager.edit(public_key, username, None, "new_password", None)
+    assert account_manager.get_pw(username, private_key) == "new_password"
+
+
+def test_create_bulk(account_manager: AccountManager):
+    private_key = PrivateKey.generate()
+    account_manager.create_bulk(
+        [("user_a", "password_a", ""), ("user_b", "password_b", "cookie")],
+        private_key.public_key,
+    )
+
+    assert account_manager.get_pw("user_a", private_key) == "password_a"
+    assert account_manager.read("user_b")["cookies"] == "cookie"
+
+
+def test_random_pick(account_manager: AccountManager):
+    public_key = PrivateKey.generate().public_key
+    account_manager.create("user_a", "password", "", public_key)
+    account_manager.create("user_b", "password", "", public_key)
+
+    account_manager.update_runtime_state("user_a", "exceed_quota", True)
+    assert account_manager.random_pick() == "user_b"
+
+    account_manager.edit(public_key, "user_b", "user_c", None, None)
+    assert account_manager.random_pick() == "user_c"
+
+    account_manager.delete("user_c")
+    with pytest.raises(SystemExit):
+        account_manager.random_pick()
+
+
 def test_check(account_manager: AccountManager):
     username = "test_user"
     password = "test_password"
@@ -186,3 +261,93 @@ def test_check(account_manager: AccountManager):
     assert account is not None
     assert account["exceed_quota"] is False
     assert account["exceed_time"] == ""
+
+
+def test_migrate_yaml(encryption_config, logger, tmp_path):
+    accounts = {
+        "test_user": {
+            "encrypted_password": "password",
+            "created_at": "2024-01-01T00:00:00",
+            "exceed_quota": False,
+            "exceed_time": "",
+            "cookies": "",
+        }
+    }
+    with open(tmp_path / "accounts.yaml", "w") as file:
+        yaml.dump(accounts, file)
+
+    key_manager = Mock(spec=KeyManager)
+    account_manager = AccountManager(logger, key_manager, str(tmp_path / "accounts.json"))
+    atexit.unregister(account_manager.flush)
+
+    assert account_manager.accounts == accounts
+    with open(tmp_path / "accounts.json") as file:
+        assert json.load(file) == accounts
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"{not json", b"null", b"[]", b'"text"', b"\xff\xfe{}"],
+    ids=["invalid_json", "null", "list", "string", "invalid_utf8"],
+)
+def test_load_invalid_accounts(mock_logger, tmp_path, content):
+    account_path = tmp_path / "accounts.json"
+    account_path.write_bytes(content)
+    key_manager = Mock(spec=KeyManager)
+
+    account_manager = AccountManager(mock_logger, key_manager, str(account_path))
+
+    assert account_manager.accounts == {}
+    mock_logger.error.assert_called_once()
+
+
+def test_flush(account_manager: AccountManager):
+    assert not account_manager._dirty
+    account_manager.flush()
+    assert not os.path.exists(account_manager.account_path)
+
+    account_manager.create("test_user", "test_password", "", PrivateKey.generate().public_key)
+    account_manager.update_account("test_user", "exceed_quota", True)
+    assert account_manager._dirty
+    assert not os.path.exists(account_manager.account_path)
+
+    account_manager.flush()
+    assert not account_manager._dirty
+    assert os.stat(account_manager.account_path).st_mode & 0o777 == 0o600
+    with open(account_manager.account_path) as file:
+        assert json.load(file)["test_user"]["exceed_quota"] is True
+
+
+def test_write_env_ignores_stale_tmp_mode(tmp_path):
+    env_path = tmp_path / ".env"
+    stale_tmp = tmp_path / ".env.tmp"
+    stale_tmp.write_text("stale")
+    os.chmod(stale_tmp, 0o644)
+
+    SecureFileHandler.write_env(str(env_path), {"ENCRYPTION_KEY": b"secret"})
+
+    assert os.stat(env_path).st_mode & 0o777 == 0o600
+    assert env_path.read_text() == "ENCRYPTION_KEY=c2VjcmV0\n"
+    assert not stale_tmp.exists()
+
+
+def test_load_secret_ignores_salt_env(monkeypatch, encryption_config, logger, tmp_path):
+    env_path = str(tmp_path / ".env")
+    path_config = {
+        "key_folder": str(tmp_path / ".keys"),
+        "env_path": env_path,
+        "master_key_file": str(tmp_path / ".keys" / "master_key.enc"),
+        "private_key_file": str(tmp_path / ".keys" / "private_key.pem"),
+        "public_key_file": str(tmp_path / ".keys" / "public_key.pem"),
+    }
+    key_manager = KeyManager(logger, encryption_config, path_config)
+    SecureFileHandler.write_env(env_path, {"ENCRYPTION_KEY": "c2VjcmV0"})
+    monkeypatch.setenv("SALT", "unrelated")
+
+    assert key_manager.load_secret(env_path) == ("c2VjcmV0", None)
+
+
+def test_cleanup():
+    data = bytearray(secrets.token_bytes(32))
+    cleanup([data])
+    assert data == bytearray(32)
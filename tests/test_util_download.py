@@ -1,8 +1,11 @@
 import shutil
+import functools
 
+import httpx
 import pytest
 
-from v2dl.utils.download import DirectoryCache, DownloadPathTool
+from v2dl.utils import Task, ThreadingService
+from v2dl.utils.download import DirectoryCache, Downloader, DownloadPathTool
 
 # ============ test is_file_exists ============
 
@@ -103,3 +106,42 @@ def test_get_image_ext():
     assert DownloadPathTool.get_image_ext("doc.docx") == "jpg"
     assert DownloadPathTool.get_image_ext("example") == "jpg"
     assert DownloadPathTool.get_image_ext("") == "jpg"
+
+
+def test_downloads_share_worker_client(monkeypatch, mock_logger, tmp_path):
+    cookies = []
+
+    def handler(request):
+        cookies.append(request.headers.get("Cookie"))
+        return httpx.Response(
+            200,
+            headers={"Content-Type": "image/png", "Set-Cookie": "session=1"},
+            content=b"data",
+        )
+
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(httpx, "Client", functools.partial(httpx.Client, transport=transport))
+
+    def download(name):
+        Downloader.download(f"https://example.com/{name}", tmp_path / name, None, 1024)
+        return Downloader.get_client()
+
+    clients = []
+    service = ThreadingService(
+        mock_logger,
+        max_workers=1,
+        initializer=functools.partial(Downloader.init_client, clients),
+        finalizer=functools.partial(Downloader.close_clients, clients),
+    )
+    other_clients = []
+    other = Downloader.init_client(other_clients)
+    service.add_tasks([Task(task_id=name, func=download, args=(name,)) for name in ("a", "b")])
+    service.stop()
+
+    first, second = service.get_results().values()
+    assert first is second
+    assert first.is_closed
+    assert not other.is_closed  # stopping the service leaves clients it does not own open
+    Downloader.close_clients(other_clients)
+    assert cookies == [None, "session=1"]
+    assert (tmp_path / "a.png").read_bytes() == b"data"
@@ -5,6 +5,7 @@ from time import sleep
 import pytest
 
 from v2dl.utils import AsyncService, Task, ThreadingService
+from v2dl.utils.factory import ServiceType, TaskServiceFactory
 
 env = os.getenv("GITHUB_ACTIONS", "false")
 WAIT_TIME = 1.0 if env != "false" else 0.1
@@ -149,7 +150,7 @@ def test_threading_stop(threading_service):
     sleep(WAIT_TIME)
     threading_service.stop()
     assert not threading_service.is_running
-    assert threading_service.workers == []
+    assert threading_service.executor is None
 
 
 @pytest.mark.asyncio
@@ -195,3 +196,99 @@ async def test_async_service_stop(async_service):
 
     assert not async_service.is_running
     assert async_service.thread is None
+
+
+@pytest.mark.asyncio
+async def test_async_concurrency_bounded_by_max_workers(async_service):
+    running = 0
+    peak = 0
+
+    async def tracked_task():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    tasks = [Task(task_id=f"task{i}", func=tracked_task) for i in range(6)]
+    async_service.add_tasks(tasks)
+    async_service.stop()
+
+    assert len(async_service.get_results()) == 6
+    assert peak == async_service.max_workers
+
+
+@pytest.mark.asyncio
+async def test_async_tasks_added_in_waves(async_service):
+    async_service.add_task(Task(task_id="first", func=async_simple_add, args=(1, 1)))
+    await asyncio.sleep(WAIT_TIME)
+    thread = async_service.thread
+
+    async_service.add_task(Task(task_id="second", func=async_simple_add, args=(2, 2)))
+    await asyncio.sleep(WAIT_TIME)
+
+    assert async_service.thread is thread and thread.is_alive()
+    assert async_service.get_results() == {"first": 2, "second": 4}
+    async_service.stop()
+
+
+def test_threading_initializer_runs_in_workers(mock_logger):
+    initialized = []
+    service = ThreadingService(
+        mock_logger, max_workers=2, initializer=initialized.append, initargs=(1,)
+    )
+
+    service.add_tasks([Task(task_id=f"task{i}", func=simple_add, args=(i, i)) for i in range(4)])
+    service.stop()
+
+    assert 1 <= len(initialized) <= 2
+    assert len(service.get_results()) == 4
+
+
+def test_threading_skips_duplicate_task_ids(threading_service):
+    calls = []
+
+    def record(value):
+        calls.append(value)
+        return value
+
+    threading_service.add_task(Task(task_id="dup", func=record, args=(1,)))
+    threading_service.add_tasks([Task(task_id="dup", func=record, args=(2,))])
+    threading_service.stop()
+
+    assert calls == [1]
+    assert threading_service.get_results() == {"dup": 1}
+
+
+@pytest.mark.asyncio
+async def test_async_skips_duplicate_task_ids(async_service):
+    async_service.add_task(Task(task_id="dup", func=async_simple_add, args=(1, 1)))
+    async_service.add_tasks([Task(task_id="dup", func=async_simple_add, args=(2, 2))])
+    async_service.stop()
+
+    assert async_service.get_results() == {"dup": 2}
+
+
+@pytest.mark.parametrize(
+    ("service_type", "cpu_count", "expected"),
+    [
+        (ServiceType.ASYNC, 2, 8),
+        (ServiceType.ASYNC, 16, 32),
+        (ServiceType.THREADING, 2, 6),
+        (ServiceType.THREADING, 64, 32),
+        (ServiceType.THREADING, None, 5),
+    ],
+)
+def test_factory_sizes_workers_from_cpu_count(
+    monkeypatch, mock_logger, service_type, cpu_count, expected
+):
+    monkeypatch.setattr(os, "cpu_count", lambda: cpu_count)
+
+    service = TaskServiceFactory.create(service_type, mock_logger, max_workers=0)
+
+    assert service.max_workers == expected
+
+
+def test_factory_rejects_negative_workers(mock_logger):
+    with pytest.raises(ValueError):
+        TaskServiceFactory.create(ServiceType.THREADING, mock_logger, max_workers=-1)
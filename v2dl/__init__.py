@@ -7,13 +7,26 @@ if sys.version_info < (3, 10):
         "You are using an unsupported version of Python. Only Python versions 3.10 and above are supported by v2dl",
     )
 import atexit
+import importlib
 from argparse import Namespace
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from . import cli, common, config, core, utils, version, web_bot
+from . import common, config, version
+
+if TYPE_CHECKING:
+    from . import cli, core, utils, web_bot
 
 __all__ = ["cli", "common", "config", "core", "utils", "version", "web_bot"]
 
+# Loaded on first access (PEP 562), so e.g. `v2dl --version` does not import the browser bots.
+_LAZY_SUBMODULES = ("cli", "core", "utils", "web_bot")
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class V2DLApp:
     def __init__(
@@ -34,6 +47,8 @@ class V2DLApp:
         Returns:
             int: The runtime status
         """
+        from . import core
+
         try:
             args = self.parse_arguments_wrapper(args)
             conf = self.setup(args)
@@ -78,6 +93,8 @@ class V2DLApp:
             return self.registered_bot[self.bot_name](conf)
 
         # use default bot, configured in config
+        from . import web_bot
+
         return web_bot.get_bot(conf)
 
     def set_bot(self, bot_name: str) -> None:
@@ -102,6 +119,7 @@ class V2DLApp:
         If input is a dict or list, convert the and pass it to the parse_args. Otherwise, calls the
         default CLI interface.
         """
+        from . import cli
 
         def init_attr(args: dict[Any, Any]) -> Namespace:
             """Initialize attribute with value None"""
@@ -122,6 +140,8 @@ class V2DLApp:
 
     def _check_cli_inputs(self, args: Namespace) -> None:
         """Check command line inputs in advance"""
+        from . import cli, utils
+
         if args.version:
             print(version.__version__)  # noqa: T201
             sys.exit(0)
@@ -144,6 +164,8 @@ class V2DLApp:
         user_agent: str = common.const.SELENIUM_AGENT,
     ) -> None:
         """Initialize instances and assign to runtime config"""
+        from . import utils
+
         logger = common.setup_logging(
             config_manager.get("runtime_config", "log_level"),
             log_path=config_manager.get("path", "system_log"),
@@ -1,12 +1,13 @@
 import os
 import sys
+import ctypes
 import getpass
 import logging
 import platform
-from collections import OrderedDict
-from collections.abc import Callable
+import functools
 from dataclasses import dataclass
 from enum import Enum
+from operator import itemgetter
 from typing import Any
 
 import questionary
@@ -15,6 +16,23 @@ from ..config import EncryptionConfig
 from ..utils import AccountManager, KeyManager
 from ..version import __package_name__
 
+_IS_WINDOWS = platform.system() == "Windows"
+
+
+@functools.cache
+def _enable_ansi_escape() -> bool:
+    """Check whether the terminal understands ANSI escapes, enabling VT mode on Windows once."""
+    if sys.platform == "win32":
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING, available since Windows 10
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    else:
+        return True
+
 
 class MenuAction(Enum):
     CREATE = "create"
@@ -56,28 +74,29 @@ class UIStrings:
     confirm_yes = "Confirm"
     CONFIRM_NO = "Cancel"
 
-    LIST_FORMAT = "Email: {username}, Exceed quota: {quota}, Exceed time: {time}, Created At: {created_at}, \nCookies: {cookies}\n"
+    LIST_FORMAT = "Email: %s, Exceed quota: %s, Exceed time: %s, Created At: %s, \nCookies: %s\n"
 
 
 class AccountManagerCLI:
-    action_map: dict[str, Callable[..., Any]] = {}
-
     def __init__(self, encrypt_config: EncryptionConfig):
         self.logger = logging.getLogger(__package_name__)
         self.logger.setLevel(logging.INFO)
         self.strings = UIStrings()
+        self.menu_choices = self.get_menu_choices()
         self.key_manager = KeyManager(self.logger, encrypt_config)
         self.account_manager = AccountManager(self.logger, self.key_manager)
         key_pair = self.key_manager.load_keys()
         self.private_key, self.public_key = key_pair.private_key, key_pair.public_key
 
     def clean_terminal(self) -> None:
-        os.system("cls" if os.name == "nt" else "clear")  # nosec
+        if _enable_ansi_escape():
+            sys.stdout.write("\x1b[2J\x1b[H")
+            sys.stdout.flush()
+        else:
+            os.system("cls")  # nosec
 
     def get_pass(self, prompt: str = "Password: ") -> str:
-        if platform.system() == "Windows":
-            return input(prompt)
-        return getpass.getpass(prompt)
+        return input(prompt) if _IS_WINDOWS else getpass.getpass(prompt)
 
     def get_menu_choices(self) -> list[dict[str, str]]:
         return [
@@ -91,7 +110,7 @@ class AccountManagerCLI:
         ]
 
     def display_menu(self) -> Any:
-        return questionary.select(self.strings.menu_prompt, choices=self.get_menu_choices()).ask()
+        return questionary.select(self.strings.menu_prompt, choices=self.menu_choices).ask()
 
     def create_account(self) -> None:
         self.clean_terminal()
@@ -109,35 +128,35 @@ class AccountManagerCLI:
         username = input(self.strings.prompt_username)
         account = self.account_manager.read(username)
         if account:
-            ordered_dict = OrderedDict()
-            ordered_dict["username"] = username
-            ordered_dict["encrypted_password"] = account["encrypted_password"]
+            print(f"username: {username}")
+            print(f"encrypted_password: {account['encrypted_password']}")
             for key, value in account.items():
-                if key not in ["username", "encrypted_password"]:
-                    ordered_dict[key] = value
-
-            for key, value in ordered_dict.items():
-                print(f"{key}: {value}")
+                if key not in {"username", "encrypted_password"}:
+                    print(f"{key}: {value}")
         else:
             print(self.strings.msg_account_not_found)
 
     def update_account(self) -> None:
         self.clean_terminal()
         print(self.strings.menu_update)
+        # ask for everything first, so decryption does not run between the prompts
         old_username = input(self.strings.prompt_old_username)
         password = self.get_pass(self.strings.prompt_password)
-        if not self.account_manager.verify_password(old_username, password, self.private_key):
-            return
         new_username = input(self.strings.prompt_new_username)
-        password = self.get_pass(self.strings.prompt_new_password)
+        new_password = self.get_pass(self.strings.prompt_new_password)
         cookies = input(self.strings.prompt_cookies)
-        self.account_manager.edit(self.public_key, old_username, new_username, password, cookies)
+        if not self.account_manager.verify_password(old_username, password, self.private_key):
+            return
+        self.account_manager.edit(
+            self.public_key, old_username, new_username, new_password, cookies
+        )
 
     def delete_account(self) -> None:
         self.clean_terminal()
         print(self.strings.menu_delete)
         username = input(self.strings.prompt_username)
-        if username in self.account_manager.accounts:
+        accounts = self.account_manager.accounts
+        if username in accounts:
             password = self.get_pass(self.strings.prompt_password)
             if not self.account_manager.verify_password(username, password, self.private_key):
                 return
@@ -173,19 +192,23 @@ class AccountManagerCLI:
         print(self.strings.menu_list)
         accounts = self.account_manager.accounts
         if accounts:
+            list_format = self.strings.LIST_FORMAT
+            fields = itemgetter("exceed_quota", "exceed_time", "created_at", "cookies")
             for username, info in accounts.items():
-                print(
-                    self.strings.LIST_FORMAT.format(
-                        username=username,
-                        quota=info["exceed_quota"],
-                        time=info["exceed_time"],
-                        created_at=info["created_at"],
-                        cookies=info["cookies"],
-                    ),
-                )
+                print(list_format % (username, *fields(info)))
         else:
             print(self.strings.msg_no_accounts)
 
+    # built once with the class, handlers are looked up on the instance so overrides apply
+    action_map: dict[str, str] = {
+        MenuAction.CREATE.value: "create_account",
+        MenuAction.READ.value: "read_account",
+        MenuAction.UPDATE.value: "update_account",
+        MenuAction.DELETE.value: "delete_account",
+        MenuAction.PASSWORD.value: "password_test",
+        MenuAction.LIST.value: "list_accounts",
+    }
+
     def execute_action(self, choice: str) -> bool:
         if choice == MenuAction.QUIT.value:
             self.clean_terminal()
@@ -194,22 +217,11 @@ class AccountManagerCLI:
 
         action = self.action_map.get(choice)
         if action:
-            action(self)
+            getattr(self, action)()
         else:
             print(self.strings.msg_invalid_choice)
         return False
 
-    @classmethod
-    def initialize_action_map(cls) -> None:
-        cls.action_map = {
-            MenuAction.CREATE.value: cls.create_account,
-            MenuAction.READ.value: cls.read_account,
-            MenuAction.UPDATE.value: cls.update_account,
-            MenuAction.DELETE.value: cls.delete_account,
-            MenuAction.PASSWORD.value: cls.password_test,
-            MenuAction.LIST.value: cls.list_accounts,
-        }
-
     def run(self) -> None:
         self.clean_terminal()
         while True:
@@ -221,5 +233,4 @@ class AccountManagerCLI:
 
 def cli(encrypt_config: EncryptionConfig) -> None:
     cli = AccountManagerCLI(encrypt_config)
-    cli.initialize_action_map()
     cli.run()
@@ -117,7 +117,7 @@ def parse_arguments(args: list[str] | None = None) -> argparse.Namespace:
         type=int,
         dest="max_worker",
         metavar="N",
-        help="maximum download concurrency",
+        help="maximum download concurrency, 0 to size it from the CPU count",
     )
     parser.add_argument(
         "--min-scroll",
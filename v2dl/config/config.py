@@ -2,6 +2,7 @@ import os
 import logging
 import argparse
 import platform
+import functools
 from copy import deepcopy
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
@@ -14,6 +15,9 @@ from ..common.const import AVAILABLE_LANGUAGES, DEFAULT_CONFIG, SELENIUM_AGENT
 if TYPE_CHECKING:
     import argparse
 
+# use the libyaml backed loader when PyYAML is built with it
+YAMLLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class ConfigPathTool:
     @staticmethod
@@ -24,8 +28,9 @@ class ConfigPathTool:
         return Path(base_dir) / path if not path.is_absolute() else path
 
     @staticmethod
+    @functools.cache
     def get_system_config_dir() -> Path:
-        """Return the config directory."""
+        """Return the config directory, resolved once per process."""
         if platform.system() == "Windows":
             base = os.getenv("APPDATA", "")
         else:
@@ -33,6 +38,7 @@ class ConfigPathTool:
         return Path(base) / "v2dl"
 
     @staticmethod
+    @functools.cache
     def get_default_download_dir() -> Path:
         return Path.home() / "Downloads"
 
@@ -80,7 +86,7 @@ class ConfigManager(ConfigPathTool):
 
         if os.path.exists(yaml_path_):
             with open(yaml_path_, encoding="utf-8") as f:
-                yaml_config = yaml.safe_load(f)
+                yaml_config = yaml.load(f, Loader=YAMLLoader)  # nosec
                 self._merge_config(self.config, yaml_config)
 
     def load_from_args(self, args: "argparse.Namespace") -> None:
@@ -89,6 +95,8 @@ class ConfigManager(ConfigPathTool):
                 f"Unsupported language: {args.language}, must be in one of the {AVAILABLE_LANGUAGES}",
             )
 
+        # read before apply_defaults fills it, so an unset flag keeps the yaml value
+        max_worker = args.max_worker
         apply_defaults(args, self.default_config)
         # =====setup static config=====
         path = "static_config"
@@ -111,6 +119,10 @@ class ConfigManager(ConfigPathTool):
         # toggle force download
         self.set(path, "force_download", args.force_download)
 
+        # setup download concurrency, 0 lets the task service size it from the CPU count
+        if max_worker is not None:
+            self.set(path, "max_worker", max_worker)
+
         # setup scroll distance
         max_s = self.default_config["static_config"]["max_scroll_length"]
         min_s = self.default_config["static_config"]["min_scroll_length"]
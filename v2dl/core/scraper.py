@@ -120,12 +120,11 @@ class ScrapeManager:
 
     def _load_urls(self) -> list[str]:
         """Load URLs from runtime_config (URL or txt file)."""
-        if self.runtime_config.url_file:
-            with open(self.runtime_config.url_file) as file:
-                urls = [line.strip() for line in file if line.strip() and not line.startswith("#")]
-        else:
-            urls = [self.runtime_config.url]
-        return urls
+        if not self.runtime_config.url_file:
+            return [self.runtime_config.url]
+
+        lines = Path(self.runtime_config.url_file).read_text(encoding="utf-8").splitlines()
+        return [line.strip() for line in lines if line.strip() and not line.startswith("#")]
 
     def _mark_urls(self, target_url: str) -> None:
         with open(self.runtime_config.url_file, "r+") as file:
@@ -478,7 +477,7 @@ class ImageScraper(BaseScraper[ImageLinkAndALT]):
 
             if not self.config.static_config.dry_run:
                 task = Task(
-                    task_id=f"{album_name}_{i}",
+                    task_id=f"{album_name}_{idx + i}",
                     func=self.download_function,
                     kwargs={
                         "url": url,
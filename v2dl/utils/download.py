@@ -2,8 +2,10 @@ import os
 import re
 import sys
 import time
+import atexit
 import asyncio
 import logging
+import threading
 from abc import ABC, abstractmethod
 from collections import OrderedDict
 from collections.abc import Callable
@@ -21,6 +23,10 @@ from ..common.const import VALID_EXTENSIONS
 from ..config.model import PathType
 
 logger = logging.getLogger()
+_thread_local = threading.local()
+# clients opened outside a task service, e.g. by direct Downloader.download calls
+_clients: list[httpx.Client] = []
+_clients_lock = threading.Lock()
 
 
 class BaseDownloadAPI(ABC):
@@ -101,6 +107,36 @@ class ActorDownloadAPI(BaseDownloadAPI):
 class Downloader:
     """Handles file downloading operations."""
 
+    @staticmethod
+    def init_client(clients: list[httpx.Client] | None = None) -> httpx.Client:
+        """Open the HTTP client of the current thread, reused by all its downloads.
+
+        The client is registered into clients, the list owned by the calling task service, or
+        into the module list closed at exit for threads outside a service.
+        """
+        client = httpx.Client(timeout=httpx.Timeout(10.0, read=5.0))
+        with _clients_lock:
+            (_clients if clients is None else clients).append(client)
+        _thread_local.client = client
+        return client
+
+    @staticmethod
+    def get_client() -> httpx.Client:
+        client: httpx.Client | None = getattr(_thread_local, "client", None)
+        if client is None or client.is_closed:
+            return Downloader.init_client()
+        return client
+
+    @staticmethod
+    def close_clients(clients: list[httpx.Client] | None = None) -> None:
+        """Close the clients registered into clients, call it once none of them is in use."""
+        with _clients_lock:
+            registry = _clients if clients is None else clients
+            closing = registry[:]
+            registry.clear()
+        for client in closing:
+            client.close()
+
     @staticmethod
     def download(
         url: str,
@@ -114,23 +150,22 @@ class Downloader:
         chunk_size = 1024
         speed_limit_bps = speed_limit_kbps * 1024
 
-        timeout = httpx.Timeout(10.0, read=5.0)
-        with httpx.Client(timeout=timeout) as client:
-            with client.stream("GET", url, headers=headers) as response:
-                response.raise_for_status()
-                ext = "." + DownloadPathTool.get_ext(response)
-                save_path = save_path.with_suffix(ext)
-
-                with open(save_path, "wb") as file:
-                    start_time = time.time()
-                    downloaded = 0
-                    for chunk in response.iter_bytes(chunk_size=chunk_size):
-                        file.write(chunk)
-                        downloaded += len(chunk)
-                        elapsed_time = time.time() - start_time
-                        expected_time = downloaded / speed_limit_bps
-                        if elapsed_time < expected_time:
-                            time.sleep(expected_time - elapsed_time)
+        client = Downloader.get_client()
+        with client.stream("GET", url, headers=headers) as response:
+            response.raise_for_status()
+            ext = "." + DownloadPathTool.get_ext(response)
+            save_path = save_path.with_suffix(ext)
+
+            with open(save_path, "wb") as file:
+                start_time = time.time()
+                downloaded = 0
+                for chunk in response.iter_bytes(chunk_size=chunk_size):
+                    file.write(chunk)
+                    downloaded += len(chunk)
+                    elapsed_time = time.time() - start_time
+                    expected_time = downloaded / speed_limit_bps
+                    if elapsed_time < expected_time:
+                        time.sleep(expected_time - elapsed_time)
 
     @staticmethod
     async def download_async(
@@ -164,6 +199,9 @@ class Downloader:
                             await asyncio.sleep(expected_time - elapsed_time)
 
 
+atexit.register(Downloader.close_clients)
+
+
 class DownloadPathTool:
     """Handles file and directory operations."""
 
@@ -1,33 +1,24 @@
+import os
+import functools
 from argparse import Namespace as NamespaceT
 from collections.abc import Callable
-from dataclasses import dataclass
 from enum import Enum
 from logging import Logger
 from typing import Any
 
+import httpx
+
 from .download import (
     ActorDownloadAPI,
     BaseDownloadAPI,
     DirectoryCache,
+    Downloader,
     ImageDownloadAPI,
     VideoDownloadAPI,
 )
 from .multitask import AsyncService, BaseTaskService, ThreadingService
 
 
-@dataclass
-class Task:
-    """Unified task container for both threading and async services."""
-
-    task_id: str
-    func: Callable[..., Any]
-    args: tuple[Any, ...] = ()
-    kwargs: dict[str, Any] | None = None
-
-    def __post_init__(self) -> None:
-        self.kwargs = self.kwargs or {}
-
-
 class ServiceType(Enum):
     """Service type enumeration."""
 
@@ -51,15 +42,33 @@ class TaskServiceFactory:
         service_type: ServiceType,
         logger: Logger,
         max_workers: int = 5,
+        initializer: Callable[..., Any] | None = None,
+        finalizer: Callable[[], Any] | None = None,
     ) -> BaseTaskService:
-        """Create a new task service instance."""
+        """Create a new task service instance, the hooks only apply to threading workers.
+
+        A max_workers of 0 sizes the pool from the CPU count, negative values are rejected.
+        """
+        if max_workers < 0:
+            raise ValueError(f"max_workers must be 0 or positive, got {max_workers}")
+        if max_workers == 0:
+            max_workers = TaskServiceFactory.default_workers(service_type)
+
         if service_type == ServiceType.THREADING:
-            return ThreadingService(logger, max_workers)
+            return ThreadingService(logger, max_workers, initializer, finalizer=finalizer)
         elif service_type == ServiceType.ASYNC:
             return AsyncService(logger, max_workers)
         else:
             raise ValueError(f"Unknown service type: {service_type}")
 
+    @staticmethod
+    def default_workers(service_type: ServiceType) -> int:
+        """Size the pool from the CPU count, downloads are I/O bound so both exceed the cores."""
+        cpu_count = os.cpu_count() or 1
+        if service_type == ServiceType.ASYNC:
+            return min(32, cpu_count * 4)
+        return min(32, cpu_count + 4)  # same as the ThreadPoolExecutor default
+
 
 class DownloadAPIFactory:
     """Factory for creating download API instances."""
@@ -102,10 +111,14 @@ def create_download_service(
 ) -> tuple[BaseTaskService, Callable[..., Any]]:
     """Create runtime configuration with integrated download service and function."""
 
+    # the worker clients of this service only, stopping it leaves other downloads running
+    clients: list[httpx.Client] = []
     download_service = TaskServiceFactory.create(
         service_type=service_type,
         logger=logger,
         max_workers=max_worker,
+        initializer=functools.partial(Downloader.init_client, clients),
+        finalizer=functools.partial(Downloader.close_clients, clients),
     )
 
     download_api = DownloadAPIFactory.create(
@@ -1,15 +1,15 @@
-import queue
 import asyncio
+import functools
 import threading
 from abc import ABC, abstractmethod
 from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from logging import Logger
-from queue import Queue
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Unified task container for both threading and async services."""
 
@@ -18,9 +18,6 @@ class Task:
     args: tuple[Any, ...] = ()
     kwargs: dict[str, Any] | None = None
 
-    def __post_init__(self) -> None:
-        self.kwargs = self.kwargs or {}
-
 
 class BaseTaskService(ABC):
     """Abstract base class for task processing services."""
@@ -59,70 +56,97 @@ class BaseTaskService(ABC):
 class ThreadingService(BaseTaskService):
     """Service for processing tasks with multiple workers."""
 
-    def __init__(self, logger: Logger, max_workers: int = 5):
-        self.task_queue: Queue[Task | None] = Queue()
+    def __init__(
+        self,
+        logger: Logger,
+        max_workers: int = 5,
+        initializer: Callable[..., Any] | None = None,
+        initargs: tuple[Any, ...] = (),
+        finalizer: Callable[[], Any] | None = None,
+    ):
         self.logger = logger
         self.max_workers = max_workers
-        self.workers: list[threading.Thread] = []
-        self.results: dict[str, Any] = {}
-        self._lock = threading.Lock()
+        # runs once in each worker thread, e.g. to open a reusable HTTP client
+        self.initializer = initializer
+        self.initargs = initargs
+        # runs in stop() once all workers are idle, e.g. to close those clients
+        self.finalizer = finalizer
+        self.executor: ThreadPoolExecutor | None = None
+        # futures in submission order; failed ones are dropped once their error is logged
+        self._futures: dict[str, Future[Any]] = {}
+        self._seen: set[str] = set()
         self.is_running = False
 
     def start(self) -> None:
-        if not self.is_running:
-            self.is_running = True
-            for _ in range(self.max_workers):
-                worker = threading.Thread(target=self._process_tasks, daemon=True)
-                self.workers.append(worker)
-                worker.start()
-
-    def _process_tasks(self) -> None:
-        while True:
-            task = self.task_queue.get()
-            if task is None:
-                break
-
-            try:
-                result = task.func(*task.args, **task.kwargs)  # type: ignore
-                with self._lock:
-                    self.results[task.task_id] = result
-            except Exception as e:
-                self.logger.error("Error processing task %s: %s", task.task_id, e)
-            finally:
-                self.task_queue.task_done()
+        self._get_executor()
 
     def add_task(self, task: Task) -> None:
-        self.task_queue.put(task)
-        if not self.is_running:
-            self.start()
+        self._submit(self._get_executor(), task)
 
     def add_tasks(self, tasks: list[Task]) -> None:
+        executor = self._get_executor()
         for task in tasks:
-            self.task_queue.put(task)
-        if not self.is_running:
-            self.start()
+            self._submit(executor, task)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                self.max_workers,
+                thread_name_prefix="v2dl",
+                initializer=self.initializer,
+                initargs=self.initargs,
+            )
+            self.is_running = True
+        return self.executor
+
+    def _submit(self, executor: ThreadPoolExecutor, task: Task) -> None:
+        if task.task_id in self._seen:
+            self.logger.debug("Skipping duplicate task %s", task.task_id)
+            return
+        self._seen.add(task.task_id)
+
+        if task.kwargs:
+            future = executor.submit(task.func, *task.args, **task.kwargs)
+        else:
+            future = executor.submit(task.func, *task.args)
+        self._futures[task.task_id] = future
+        future.add_done_callback(functools.partial(self._on_done, task.task_id))
+
+    def _on_done(self, task_id: str, future: Future[Any]) -> None:
+        if (e := future.exception()) is not None:
+            self.logger.error("Error processing task %s: %s", task_id, e)
+            self._futures.pop(task_id, None)
 
     def get_result(self, task_id: str) -> Any | None:
-        with self._lock:
-            return self.results.pop(task_id, None)
+        future = self._futures.get(task_id)
+        if future is None or not future.done() or future.exception() is not None:
+            return None
+        del self._futures[task_id]
+        return future.result()
 
     def get_results(self, max_results: int = 0) -> dict[str, Any]:
-        with self._lock:
-            if max_results <= 0:
-                results_to_return = self.results.copy()
-                self.results.clear()
-                return results_to_return
-
-            keys = list(self.results.keys())[:max_results]
-            return {key: self.results.pop(key) for key in keys}
+        results: dict[str, Any] = {}
+        for task_id, future in list(self._futures.items()):
+            if 0 < max_results <= len(results):
+                break
+            if future.done() and future.exception() is None:
+                results[task_id] = future.result()
+                del self._futures[task_id]
+        return results
 
     def stop(self, timeout: int | None = None) -> None:
-        self.task_queue.join()
-        for _ in range(self.max_workers):
-            self.task_queue.put(None)
-        for worker in self.workers:
-            worker.join(timeout=timeout)
-        self.workers.clear()
+        if self.executor is not None:
+            if timeout is None:
+                self.executor.shutdown(wait=True)
+                idle = True
+            else:
+                _, not_done = wait(list(self._futures.values()), timeout=timeout)
+                self.executor.shutdown(wait=False)
+                idle = not not_done
+            self.executor = None
+            if self.finalizer is not None and idle:
+                self.finalizer()
+        self._seen.clear()
         self.is_running = False
 
 
@@ -130,89 +154,123 @@ class AsyncService(BaseTaskService):
     def __init__(self, logger: Logger, max_workers: int = 5) -> None:
         self.max_workers = max_workers
         self.logger = logger
-        self.is_running = False
         self.loop: asyncio.AbstractEventLoop | None = None
         self.thread: threading.Thread | None = None
         self._lock = threading.Lock()
+        self._running = threading.Event()
 
-        self.task_queue: queue.Queue[Task] = queue.Queue()
+        # the queue lives on the event loop, producers hand tasks over with call_soon_threadsafe
+        self._handle: tuple[asyncio.AbstractEventLoop, asyncio.Queue[Task | None]] | None = None
         self.results: dict[str, Any] = {}
-        self.current_tasks: list[asyncio.Task[Any]] = []
-        self.sem = asyncio.Semaphore(self.max_workers)
+        self._seen: set[str] = set()
+
+    @property
+    def is_running(self) -> bool:
+        return self._running.is_set()
 
     def start(self) -> None:
         self._check_thread()
 
     def add_task(self, task: Task) -> None:
-        self.task_queue.put(task)
-        self._check_thread()
+        if self._is_duplicate(task):
+            return
+        loop, task_queue = self._check_thread()
+        loop.call_soon_threadsafe(task_queue.put_nowait, task)
 
     def add_tasks(self, tasks: list[Task]) -> None:
-        for task in tasks:
-            self.task_queue.put(task)
-        self._check_thread()
+        tasks = [task for task in tasks if not self._is_duplicate(task)]
+        loop, task_queue = self._check_thread()
+        loop.call_soon_threadsafe(self._put_tasks, task_queue, tasks)
+
+    def _is_duplicate(self, task: Task) -> bool:
+        """Remember the task id, return True if it was already queued since the last stop."""
+        if task.task_id in self._seen:
+            self.logger.debug("Skipping duplicate task %s", task.task_id)
+            return True
+        self._seen.add(task.task_id)
+        return False
 
     def get_result(self, task_id: str) -> Any | None:
-        with self._lock:
-            return self.results.pop(task_id, None)
+        return self.results.pop(task_id, None)
 
     def get_results(self, max_results: int = 0) -> dict[str, Any]:
-        with self._lock:
-            if max_results <= 0:
-                results_to_return = self.results.copy()
-                self.results.clear()
-                return results_to_return
+        # only the loop thread writes results and a dict store is atomic under the GIL, so pop a
+        # snapshot of the keys instead of locking
+        keys = list(self.results)
+        if max_results > 0:
+            keys = keys[:max_results]
+        return {key: self.results.pop(key) for key in keys}
+
+    @staticmethod
+    def _put_tasks(task_queue: asyncio.Queue[Task | None], tasks: list[Task]) -> None:
+        for task in tasks:
+            task_queue.put_nowait(task)
 
-            keys = list(self.results.keys())[:max_results]
-            return {key: self.results.pop(key) for key in keys}
+    async def _process_tasks(self, task_queue: asyncio.Queue[Task | None]) -> None:
+        # a fixed pool of worker coroutines bounds the concurrency to max_workers
+        await asyncio.gather(*(self._worker(task_queue) for _ in range(self.max_workers)))
 
-    async def _process_tasks(self) -> None:
+    async def _worker(self, task_queue: asyncio.Queue[Task | None]) -> None:
         while True:
-            self.current_tasks = [task for task in self.current_tasks if not task.done()]
-
-            if self.task_queue.empty() and not self.current_tasks:
+            task = await task_queue.get()
+            if task is None:
+                task_queue.put_nowait(None)  # pass the stop sentinel on to the next worker
                 break
-
-            while not self.task_queue.empty() and len(self.current_tasks) < self.max_workers:
-                task = self.task_queue.get_nowait()
-                task_obj = asyncio.create_task(self._run_task(task))
-                self.current_tasks.append(task_obj)
-
-            if self.current_tasks:
-                await asyncio.wait(self.current_tasks, return_when=asyncio.FIRST_COMPLETED)
+            await self._run_task(task)
 
     async def _run_task(self, task: Task) -> Any:
-        async with self.sem:
-            try:
-                result = await task.func(*task.args, **task.kwargs)  # type: ignore
-                with self._lock:
-                    self.results[task.task_id] = result
-                return result
-            except Exception as e:
-                self.logger.error(f"Error processing task {task.task_id}: {e}")
-                with self._lock:
-                    self.results[task.task_id] = None
-
-    def _check_thread(self) -> None:
+        try:
+            if task.kwargs:
+                result = await task.func(*task.args, **task.kwargs)
+            else:
+                result = await task.func(*task.args)
+            self.results[task.task_id] = result
+            return result
+        except Exception as e:
+            self.logger.error(f"Error processing task {task.task_id}: {e}")
+            self.results[task.task_id] = None
+
+    def _check_thread(self) -> tuple[asyncio.AbstractEventLoop, asyncio.Queue[Task | None]]:
+        # fast path without the lock once the loop thread is up
+        handle = self._handle
+        if handle is not None and self._running.is_set():
+            return handle
+
         with self._lock:
-            if not self.is_running or self.thread is None or not self.thread.is_alive():
-                self.is_running = True
-                self.thread = threading.Thread(target=self._start_event_loop)
+            handle = self._handle
+            if handle is None or not self._running.is_set():
+                self.loop = asyncio.new_event_loop()
+                handle = self._handle = (self.loop, asyncio.Queue())
+                self._running.set()
+                self.thread = threading.Thread(
+                    target=self._start_event_loop, args=handle, daemon=True
+                )
                 self.thread.start()
+            return handle
 
-    def _start_event_loop(self) -> None:
-        self.loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self.loop)
+    def _start_event_loop(
+        self, loop: asyncio.AbstractEventLoop, task_queue: asyncio.Queue[Task | None]
+    ) -> None:
+        asyncio.set_event_loop(loop)
         try:
-            self.loop.run_until_complete(self._process_tasks())
+            loop.run_until_complete(self._process_tasks(task_queue))
         finally:
-            self.loop.close()
-            self.loop = None
-            self.is_running = False
-            self.current_tasks.clear()
+            loop.close()
+            with self._lock:
+                # a stop() that timed out may already have let a new loop start
+                if self.loop is loop:
+                    self.loop = None
+                    self._handle = None
+                    self._running.clear()
 
     def stop(self, timeout: int | None = None) -> None:
         if self.thread is not None:
+            handle = self._handle
+            if handle is not None and self._running.is_set():
+                # the sentinel queues up behind the pending tasks
+                loop, task_queue = handle
+                loop.call_soon_threadsafe(task_queue.put_nowait, None)
             self.thread.join(timeout=timeout)
             self.thread = None
-            self.is_running = False
+            self._running.clear()
+        self._seen.clear()
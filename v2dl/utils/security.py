@@ -1,31 +1,33 @@
 import os
 import sys
+import json
 import atexit
 import base64
 import ctypes
 import random
 import secrets
+import functools
 import threading
+import contextlib
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from logging import Logger
-from typing import Any, Literal, overload
-
-import yaml
-from dotenv import load_dotenv, set_key
-from nacl.public import PrivateKey, PublicKey, SealedBox
-from nacl.pwhash import argon2id
-from nacl.secret import SecretBox
-from nacl.utils import EncryptedMessage, random as nacl_random
+from typing import TYPE_CHECKING, Any, Literal, overload
 
 from ..common import SecurityError
 from ..config import ConfigManager, EncryptionConfig
 
+# PyNaCl, python-dotenv and PyYAML are imported where they are used, so importing v2dl does not
+# load libsodium until the encryption is actually needed.
+if TYPE_CHECKING:
+    from nacl.public import PrivateKey, PublicKey, SealedBox
+    from nacl.utils import EncryptedMessage
+
 
 @dataclass
 class KeyPair:
-    private_key: PrivateKey
-    public_key: PublicKey
+    private_key: "PrivateKey"
+    public_key: "PublicKey"
 
 
 class Encryptor:
@@ -34,58 +36,82 @@ class Encryptor:
     def __init__(self, logger: Logger, encrypt_config: EncryptionConfig) -> None:
         self.logger = logger
         self.encrypt_config = encrypt_config
+        self._kdf_cache: dict[tuple[bytes, bytes], bytearray] = {}
+        self._kdf_lock = threading.Lock()
+        # the same key pair is used for the whole process, keep the last box built for each key
+        self._encrypt_box: tuple[PublicKey, SealedBox[PublicKey]] | None = None
+        self._decrypt_box: tuple[PrivateKey, SealedBox[PrivateKey]] | None = None
+        # only legacy keys fill the cache, register the atexit cleanup on the first insert
+        self._atexit_registered = False
 
-    def encrypt_master_key(self, master_key: bytes) -> tuple[bytes, bytes, bytes]:
-        salt = secrets.token_bytes(self.encrypt_config.salt_bytes)
-        encryption_key = secrets.token_bytes(self.encrypt_config.key_bytes)
-        derived_key = self.derive_key(encryption_key, salt)
+    def encrypt_master_key(self, master_key: bytes) -> tuple[bytes, bytes]:
+        from nacl.secret import SecretBox
 
-        box = SecretBox(derived_key)
-        nonce = nacl_random(self.encrypt_config.nonce_bytes)
+        encryption_key = secrets.token_bytes(self.encrypt_config.key_bytes)
+        box = SecretBox(encryption_key)
+        nonce = os.urandom(self.encrypt_config.nonce_bytes)
         encrypted_master_key = box.encrypt(master_key, nonce)
 
-        derived_key = bytearray(len(derived_key))
         self.logger.info("Master key encryption successful")
-        return encrypted_master_key, salt, encryption_key
+        return encrypted_master_key, encryption_key
 
     def decrypt_master_key(
         self,
         encrypted_master_key: bytes,
-        salt: str,
         encryption_key: str,
+        salt: str | None = None,
     ) -> bytes:
-        salt_b64 = base64.b64decode(salt)
-        enc_key_b64 = base64.b64decode(encryption_key)
-        derived_key = self.derive_key(enc_key_b64, salt_b64)
-        box = SecretBox(derived_key)
+        """Decrypt the master key.
+
+        The salt only exists in keys generated by older versions, which wrapped the master key
+        with an argon2id derived key. New keys are wrapped by the encryption_key directly.
+        """
+        from nacl.secret import SecretBox
+
+        key = base64.b64decode(encryption_key)
+        if salt:
+            key = self.derive_key(key, base64.b64decode(salt))
+        box = SecretBox(key)
 
         master_key = box.decrypt(encrypted_master_key)
 
         self.logger.info("Master key decryption successful")
         return master_key
 
-    def encrypt_private_key(self, private_key: PrivateKey, master_key: bytes) -> EncryptedMessage:
+    def encrypt_private_key(
+        self, private_key: "PrivateKey", master_key: bytes
+    ) -> "EncryptedMessage":
+        from nacl.secret import SecretBox
+
         box = SecretBox(master_key)
-        nonce = nacl_random(self.encrypt_config.nonce_bytes)
+        nonce = os.urandom(self.encrypt_config.nonce_bytes)
         return box.encrypt(private_key.encode(), nonce)
 
-    def decrypt_private_key(self, encrypted_private_key: bytes, master_key: bytes) -> PrivateKey:
+    def decrypt_private_key(self, encrypted_private_key: bytes, master_key: bytes) -> "PrivateKey":
+        from nacl.public import PrivateKey
+        from nacl.secret import SecretBox
+
         box = SecretBox(master_key)
-        private_key_bytes = box.decrypt(encrypted_private_key)
-        private_key = PrivateKey(private_key_bytes)
-        cleanup([private_key_bytes])
-        return private_key
+        return PrivateKey(box.decrypt(encrypted_private_key))
 
-    def encrypt_password(self, password: str, public_key: PublicKey) -> str:
-        sealed_box = SealedBox(public_key)
+    def encrypt_password(self, password: str, public_key: "PublicKey") -> str:
+        if self._encrypt_box is None or self._encrypt_box[0] is not public_key:
+            from nacl.public import SealedBox
+
+            self._encrypt_box = (public_key, SealedBox(public_key))
+        sealed_box = self._encrypt_box[1]
         encrypted = sealed_box.encrypt(password.encode())
         self.logger.info("Password encryption successful")
         return base64.b64encode(encrypted).decode("utf-8")
 
-    def decrypt_password(self, encrypted_password: str, private_key: PrivateKey) -> str:
+    def decrypt_password(self, encrypted_password: str, private_key: "PrivateKey") -> str:
         try:
             encrypted = base64.b64decode(encrypted_password)
-            sealed_box = SealedBox(private_key)
+            if self._decrypt_box is None or self._decrypt_box[0] is not private_key:
+                from nacl.public import SealedBox
+
+                self._decrypt_box = (private_key, SealedBox(private_key))
+            sealed_box = self._decrypt_box[1]
             decrypted = sealed_box.decrypt(encrypted)
             return decrypted.decode()
         except Exception as e:
@@ -93,15 +119,37 @@ class Encryptor:
             raise SecurityError from e
 
     def derive_key(self, encryption_key: bytes, salt: bytes) -> bytes:
-        return argon2id.kdf(
-            self.encrypt_config.key_bytes,
-            encryption_key,
-            salt,
-            opslimit=self.encrypt_config.kdf_ops_limit,
-            memlimit=self.encrypt_config.kdf_mem_limit,
-        )
+        """Derive the key with argon2id, the result is cached by (salt, encryption_key)."""
+        cache_key = (salt, encryption_key)
+        with self._kdf_lock:
+            cached = self._kdf_cache.get(cache_key)
+            if cached is not None:
+                return bytes(cached)
+
+            from nacl.pwhash import argon2id
+
+            derived_key = argon2id.kdf(
+                self.encrypt_config.key_bytes,
+                encryption_key,
+                salt,
+                opslimit=self.encrypt_config.kdf_ops_limit,
+                memlimit=self.encrypt_config.kdf_mem_limit,
+            )
+            self._kdf_cache[cache_key] = bytearray(derived_key)
+            if not self._atexit_registered:
+                atexit.register(self.clear_kdf_cache)
+                self._atexit_registered = True
+        return derived_key
+
+    def clear_kdf_cache(self) -> None:
+        """Zero out and drop all cached derived keys."""
+        with self._kdf_lock:
+            cleanup(list(self._kdf_cache.values()))
+            self._kdf_cache.clear()
+
+    def validate_keypair(self, private_key: "PrivateKey", public_key: "PublicKey") -> None:
+        from nacl.public import SealedBox
 
-    def validate_keypair(self, private_key: PrivateKey, public_key: PublicKey) -> None:
         try:
             test_data = b"test"
             sealed_box = SealedBox(public_key)
@@ -129,6 +177,13 @@ class KeyIOHelper(Encryptor):
         super().__init__(logger, encrypt_config)
         self.logger = logger
         self.path_config = self.init_conf(path_config)
+        # the paths are fixed after init, keep them as attributes
+        self._key_folder = self.path_config["key_folder"]
+        self._env_path = self.path_config["env_path"]
+        self._master_key_file = self.path_config["master_key_file"]
+        self._private_key_file = self.path_config["private_key_file"]
+        self._public_key_file = self.path_config["public_key_file"]
+        self._validated = False
 
     def init_conf(self, path_config: dict[str, str] | None) -> dict[str, str]:
         if path_config is None:
@@ -150,54 +205,73 @@ class KeyIOHelper(Encryptor):
         private_key = self.load_private_key(master_key)
         public_key = self.load_public_key()
 
-        self.validate_keypair(private_key, public_key)
-        cleanup([master_key])
+        # the key files do not change within a process, validate the pair only on the first load
+        if not self._validated:
+            self.validate_keypair(private_key, public_key)
+            self._validated = True
 
         self.logger.info("Keys loaded and validated successfully")
         return KeyPair(private_key, public_key)
 
-    def load_secret(self, env_path: str) -> tuple[str, str]:
-        """Load and validate salt and encryption_key from .env file."""
-        load_dotenv(env_path)
-        salt_base64 = SecureFileHandler.read_env("SALT")
-        encryption_key_base64 = SecureFileHandler.read_env("ENCRYPTION_KEY")
-        return salt_base64, encryption_key_base64
+    def load_secret(self, env_path: str) -> tuple[str, str | None]:
+        """Load and validate encryption_key and the legacy salt from .env file."""
+        try:
+            st = os.stat(env_path)
+            env = _read_env_file(env_path, st.st_mtime_ns, st.st_ino, st.st_size)
+        except FileNotFoundError:
+            env = {}
+
+        # variables already set in the environment take precedence, same as load_dotenv
+        encryption_key_base64 = os.environ.get("ENCRYPTION_KEY") or env.get("ENCRYPTION_KEY")
+        if not encryption_key_base64:
+            raise SecurityError(
+                "Missing required environment variable: ENCRYPTION_KEY, please check your key files"
+            )
+        # the salt only ever lived in the .env of legacy installs, never in the shell environment
+        return encryption_key_base64, env.get("SALT")
 
     def load_master_key(self, path: str | None = None) -> bytes:
-        _path = self.path_config["master_key_file"] if path is None else path
-        encrypted_master_key = SecureFileHandler.read_file(_path, False)
-        salt, encryption_key = self.load_secret(self.path_config["env_path"])
-        return self.decrypt_master_key(encrypted_master_key, salt, encryption_key)
-
-    def load_public_key(self, path: str | None = None) -> PublicKey:
-        _path = self.path_config["public_key_file"] if path is None else path
-        public_key_bytes = SecureFileHandler.read_file(_path, False)
+        path = path or self._master_key_file
+        encrypted_master_key = SecureFileHandler.read_file(path, False)
+        encryption_key, salt = self.load_secret(self._env_path)
+        return self.decrypt_master_key(encrypted_master_key, encryption_key, salt)
+
+    def load_public_key(self, path: str | None = None) -> "PublicKey":
+        from nacl.public import PublicKey
+
+        path = path or self._public_key_file
+        public_key_bytes = SecureFileHandler.read_file(path, False)
         return PublicKey(public_key_bytes)
 
-    def load_private_key(self, master_key: bytes, path: str | None = None) -> PrivateKey:
-        _path = self.path_config["private_key_file"] if path is None else path
-        encrypted_private_key = SecureFileHandler.read_file(_path, False)
+    def load_private_key(self, master_key: bytes, path: str | None = None) -> "PrivateKey":
+        path = path or self._private_key_file
+        encrypted_private_key = SecureFileHandler.read_file(path, False)
         return self.decrypt_private_key(encrypted_private_key, master_key)
 
-    def save_keys(self, keys: tuple[bytes, bytes, PublicKey, bytes, bytes]) -> None:
-        SecureFileHandler.write_file(self.path_config["master_key_file"], keys[0])
-        SecureFileHandler.write_file(self.path_config["private_key_file"], keys[1])
-        SecureFileHandler.write_file(self.path_config["public_key_file"], keys[2].encode(), 0o644)
-        SecureFileHandler.write_env(self.path_config["env_path"], "SALT", keys[3])
-        SecureFileHandler.write_env(self.path_config["env_path"], "ENCRYPTION_KEY", keys[4])
+    def save_keys(self, keys: tuple[bytes, bytes, "PublicKey", bytes]) -> None:
+        SecureFileHandler.write_file(self._master_key_file, keys[0])
+        SecureFileHandler.write_file(self._private_key_file, keys[1])
+        SecureFileHandler.write_file(self._public_key_file, keys[2].encode(), 0o644)
+        SecureFileHandler.write_env(self._env_path, {"ENCRYPTION_KEY": keys[3]})
 
     def check_folder(self) -> None:
-        if not os.path.exists(self.path_config["key_folder"]):
-            os.makedirs(self.path_config["key_folder"], mode=0o700)
-            self.logger.info("Secure folder created at %s", self.path_config["key_folder"])
-        elif not self.check_permission(self.path_config["key_folder"]):
-            os.chmod(self.path_config["key_folder"], 0o700)
-            self.logger.info("Permissions updated for folder at %s", self.path_config["key_folder"])
-
-    def check_permission(self, folder_path: str) -> bool:
+        key_folder = self._key_folder
+        try:
+            st_mode = os.stat(key_folder).st_mode
+        except FileNotFoundError:
+            os.makedirs(key_folder, mode=0o700)
+            self.logger.info("Secure folder created at %s", key_folder)
+            return
+
+        if not self.check_permission(key_folder, st_mode):
+            os.chmod(key_folder, 0o700)
+            self.logger.info("Permissions updated for folder at %s", key_folder)
+
+    def check_permission(self, folder_path: str, st_mode: int | None = None) -> bool:
         folder_permission = 0o700
-        current_permissions = os.stat(folder_path).st_mode & 0o777
-        return current_permissions == folder_permission
+        if st_mode is None:
+            st_mode = os.stat(folder_path).st_mode
+        return st_mode & 0o777 == folder_permission
 
 
 class KeyManager(KeyIOHelper):
@@ -216,7 +290,7 @@ class KeyManager(KeyIOHelper):
         if keys is not None:
             self.save_keys(keys)
 
-    def _init_keys(self) -> tuple[bytes, bytes, PublicKey, bytes, bytes] | None:
+    def _init_keys(self) -> tuple[bytes, bytes, "PublicKey", bytes] | None:
         if self._keys_exist():
             self.logger.info("Key pair already exists")
             return None
@@ -224,27 +298,27 @@ class KeyManager(KeyIOHelper):
         return self._generate_and_encrypt_keys()
 
     def _keys_exist(self) -> bool:
-        return os.path.exists(self.path_config["private_key_file"]) and os.path.exists(
-            self.path_config["public_key_file"],
+        return os.path.exists(self._private_key_file) and os.path.exists(
+            self._public_key_file,
         )
 
-    def _generate_and_encrypt_keys(self) -> tuple[bytes, bytes, PublicKey, bytes, bytes]:
+    def _generate_and_encrypt_keys(self) -> tuple[bytes, bytes, "PublicKey", bytes]:
         keys = self._generate_key_pair()
         master_key = secrets.token_bytes(self.encrypt_config.key_bytes)
-        encrypted_master_key, salt, encryption_key = self.encrypt_master_key(master_key)
+        encrypted_master_key, encryption_key = self.encrypt_master_key(master_key)
         encrypted_private_key = self.encrypt_private_key(keys.private_key, master_key)
 
-        cleanup([master_key])
         self.logger.info("Key pair has been successfully generated")
         return (
             encrypted_master_key,
             encrypted_private_key,
             keys.public_key,
-            salt,
             encryption_key,
         )
 
     def _generate_key_pair(self) -> KeyPair:
+        from nacl.public import PrivateKey
+
         private_key = PrivateKey.generate()
         return KeyPair(private_key, private_key.public_key)
 
@@ -252,20 +326,25 @@ class KeyManager(KeyIOHelper):
 class AccountManager:
     MAX_QUOTA = 16
 
-    def __init__(self, logger: Logger, key_manager: KeyManager, yaml_path: str = ""):
+    def __init__(self, logger: Logger, key_manager: KeyManager, account_path: str = ""):
         self.logger = logger
-        self.yaml_path = (
-            yaml_path
-            if yaml_path
-            else os.path.join(ConfigManager.get_system_config_dir(), "accounts.yaml")
+        self.account_path = (
+            account_path
+            if account_path
+            else os.path.join(ConfigManager.get_system_config_dir(), "accounts.json")
         )
         self.key_manager = key_manager
         self.lock = threading.RLock()
-        self.accounts, self.runtime_state = self._load_yaml()
+        self._dirty = False
+        self._atexit_registered = False
+        self._pw_cache: dict[str, str] = {}
+        self.accounts, self.runtime_state = self._load_accounts()
+        self._eligible = [
+            account for account in self.runtime_state if self.is_valid_account(account)
+        ]
         self.check()
-        atexit.register(self._save_yaml)
 
-    def create(self, username: str, password: str, cookies: str, public_key: PublicKey) -> None:
+    def create(self, username: str, password: str, cookies: str, public_key: "PublicKey") -> None:
         with self.lock:
             encrypted_password = self.key_manager.encrypt_password(password, public_key)
             self.accounts[username] = {
@@ -275,24 +354,36 @@ class AccountManager:
                 "exceed_time": "",
                 "cookies": cookies,
             }
+            self._pw_cache.pop(username, None)
+            self.runtime_state.setdefault(username, self._default_state())
+            self._refresh_eligible(username)
+            self._mark_dirty()
         self.logger.info("Account %s has been created.", username)
-        self._save_yaml()
+
+    def create_bulk(self, accounts: list[tuple[str, str, str]], public_key: "PublicKey") -> None:
+        """Create multiple accounts from (username, password, cookies) under a single lock."""
+        with self.lock:
+            for username, password, cookies in accounts:
+                self.create(username, password, cookies, public_key)
 
     def delete(self, username: str) -> None:
         with self.lock:
             if username in self.accounts:
                 del self.accounts[username]
+                self._pw_cache.pop(username, None)
+                self.runtime_state.pop(username, None)
+                self._refresh_eligible(username)
+                self._mark_dirty()
                 self.logger.info("Account %s has been deleted.", username)
             else:
                 self.logger.error("Account %s not found.", username)
-            self._save_yaml()
 
     def read(self, username: str) -> dict[str, Any] | None:
         return self.accounts.get(username)
 
     def edit(
         self,
-        public_key: PublicKey,
+        public_key: "PublicKey",
         old_username: str,
         new_username: str | None,
         new_password: str | None,
@@ -300,8 +391,15 @@ class AccountManager:
     ) -> None:
         with self.lock:
             if old_username in self.accounts:
+                self._pw_cache.pop(old_username, None)
                 if new_username:
+                    self._pw_cache.pop(new_username, None)
                     self.accounts[new_username] = self.accounts.pop(old_username)
+                    self.runtime_state[new_username] = self.runtime_state.pop(
+                        old_username, self._default_state()
+                    )
+                    self._refresh_eligible(old_username)
+                    self._refresh_eligible(new_username)
                 if new_password:
                     encrypted_password = self.key_manager.encrypt_password(new_password, public_key)
                     self.accounts[new_username or old_username]["encrypted_password"] = (
@@ -309,12 +407,13 @@ class AccountManager:
                     )
                 if new_cookies:
                     self.accounts[new_username or old_username]["cookies"] = new_cookies
+                self._mark_dirty()
                 self.logger.info("Account %s has been updated.", old_username)
             else:
                 self.logger.error("Account not found.")
 
     def update_account(self, account: str, field: str, value: Any) -> None:
-        """Update account status of accounts.yaml
+        """Update account status of accounts.json
 
         Args:
             account (str): The account to update
@@ -326,8 +425,8 @@ class AccountManager:
             if account_info:
                 if field in account_info:
                     account_info[field] = value
-                    self.logger.debug("Updated yaml %s for account %s.", field, account)
-                    self._save_yaml()
+                    self._mark_dirty()
+                    self.logger.debug("Updated %s for account %s.", field, account)
                 else:
                     self.logger.error(
                         "Field '%s' does not exist in account '%s'.", field, account_info
@@ -340,20 +439,25 @@ class AccountManager:
         if account_info:
             if field in account_info:
                 account_info[field] = value
+                self._refresh_eligible(account)
                 self.logger.debug("Updated runtime status %s for account %s.", field, account)
             else:
                 self.logger.error("Field '%s' does not exist in the account.", field)
         else:
             self.logger.error("Account %s not found.", account)
 
-    def verify_password(self, account: str, password: str, private_key: PrivateKey) -> bool:
+    def verify_password(self, account: str, password: str, private_key: "PrivateKey") -> bool:
         account_info = self.accounts.get(account)
         if not account_info:
             self.logger.error("Account does not exist.")
             return False
 
         encrypted_password = account_info.get("encrypted_password")
-        decrypted_password = self.key_manager.decrypt_password(encrypted_password, private_key)
+        if not encrypted_password:
+            self.logger.error("Account %s has no stored password.", account)
+            return False
+
+        decrypted_password = self._decrypt_password(account, encrypted_password, private_key)
         if decrypted_password == password:
             print("*----------------*")
             print("|Password correct|")
@@ -372,63 +476,121 @@ class AccountManager:
         可能需要重複下載卻會被 exceed_quota 阻擋，現在他只會紀錄而不會被真正用於判斷，判斷改成每次運行時紀錄帳號
         額度避免重複挑選。
         """
-        now = datetime.now()
-        update = False
+        # exceed_time 皆以固定寬度的 ISO 格式寫入，可直接以字串比較
+        cutoff = (datetime.now() - timedelta(hours=12)).strftime("%Y-%m-%dT%H:%M:%S")
 
         for _, account in self.accounts.items():
             if exceed_time := account["exceed_time"]:  # 如果不是空字串就進入檢查
-                exceed_time_ = datetime.strptime(exceed_time, "%Y-%m-%dT%H:%M:%S")
-                if now - exceed_time_ > timedelta(hours=12):
+                if exceed_time < cutoff:
                     account["exceed_time"] = ""
                     account["exceed_quota"] = False
-                    update = True
-
-        if update:
-            self._save_yaml()
+                    self._mark_dirty()
 
     def random_pick(self) -> str:
-        accounts = {k: v for k, v in self.accounts.items() if self.is_valid_account(k)}
-        if not accounts:
+        if not self._eligible:
             self.logger.info("No eligible accounts available for login. Existing.")
             sys.exit(0)
 
-        account, _ = random.choice(list(accounts.items()))
-        return account
+        return random.choice(self._eligible)
 
-    def get_pw(self, account: str, private_key: PrivateKey) -> str:
+    def get_pw(self, account: str, private_key: "PrivateKey") -> str:
         account_info = self.accounts[account]
         enc_pw = account_info["encrypted_password"]
-        return self.key_manager.decrypt_password(enc_pw, private_key)
+        return self._decrypt_password(account, enc_pw, private_key)
+
+    def _decrypt_password(self, account: str, enc_pw: str, private_key: "PrivateKey") -> str:
+        """Decrypt the password of an account once and reuse it for later lookups."""
+        with self.lock:
+            password = self._pw_cache.get(account)
+            if password is None:
+                password = self.key_manager.decrypt_password(enc_pw, private_key)
+                self._pw_cache[account] = password
+            return password
 
     def is_valid_account(self, account: str) -> bool:
         """filter invalid account during runtime based on cookies, password and quota"""
         state = self.runtime_state[account]
         return (state["cookies_valid"] or state["password_valid"]) and not state["exceed_quota"]
 
-    def _save_yaml(self) -> None:
+    def _refresh_eligible(self, account: str) -> None:
+        """Keep the list of pickable accounts in sync after the account or its state changed."""
+        with self.lock:
+            eligible = account in self.runtime_state and self.is_valid_account(account)
+            if eligible and account not in self._eligible:
+                self._eligible.append(account)
+            elif not eligible and account in self._eligible:
+                self._eligible.remove(account)
+
+    def _mark_dirty(self) -> None:
+        """Flag accounts as modified and make sure they are saved at exit."""
+        self._dirty = True
+        if not self._atexit_registered:
+            atexit.register(self.flush)
+            self._atexit_registered = True
+
+    def flush(self) -> None:
+        """Write the accounts file if there are unsaved changes.
+
+        Mutations only mark the accounts as dirty, the file is written once here, which is also
+        registered with atexit.
+        """
         with self.lock:
-            with open(self.yaml_path, "w") as file:
-                yaml.dump(self.accounts, file, default_flow_style=False)
+            if not self._dirty:
+                return
+            data = json.dumps(self.accounts, indent=4, ensure_ascii=False).encode("utf-8")
+            SecureFileHandler._atomic_write(self.account_path, data, 0o600)
+            self._dirty = False
         # self.logger.info("Successfully update accounts information.")
 
-    def _load_yaml(self) -> tuple[dict[str, Any], dict[str, Any]]:
+    def _load_accounts(self) -> tuple[dict[str, Any], dict[str, Any]]:
         try:
-            with open(self.yaml_path) as file:
-                account = yaml.safe_load(file) or {}
-            runtime_state = self._login_state(account)
-            return account, runtime_state
+            with open(self.account_path, encoding="utf-8") as file:
+                account = json.load(file)
         except FileNotFoundError:
-            return {}, {}
+            account = self._migrate_yaml()
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            self.logger.error("Failed to parse %s: %s", self.account_path, e)
+            account = {}
+        if not isinstance(account, dict):
+            self.logger.error("Invalid account file %s, expected a mapping", self.account_path)
+            account = {}
+        runtime_state = self._login_state(account)
+        return account, runtime_state
+
+    def _migrate_yaml(self) -> dict[str, Any]:
+        """Convert the accounts.yaml used by older versions to accounts.json."""
+        import yaml
+
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        yaml_path = os.path.splitext(self.account_path)[0] + ".yaml"
+        try:
+            with open(yaml_path, encoding="utf-8") as file:
+                account = yaml.load(file, Loader=loader) or {}  # nosec
+        except FileNotFoundError:
+            return {}
+        except (yaml.YAMLError, UnicodeDecodeError) as e:
+            self.logger.error("Failed to parse %s: %s", yaml_path, e)
+            return {}
+        if not isinstance(account, dict):
+            self.logger.error("Invalid account file %s, expected a mapping", yaml_path)
+            return {}
+
+        self.accounts = account
+        self._mark_dirty()
+        self.flush()
+        self.logger.info("Migrated accounts from %s to %s", yaml_path, self.account_path)
+        return account
 
     def _login_state(self, accounts: dict[str, Any]) -> dict[str, Any]:
         """Store login status. Use an individual variable for not storing back to file"""
+        return {account: self._default_state() for account in accounts}
+
+    @staticmethod
+    def _default_state() -> dict[str, bool]:
         return {
-            account: {
-                "cookies_valid": True,
-                "password_valid": True,
-                "exceed_quota": False,
-            }
-            for account in accounts
+            "cookies_valid": True,
+            "password_valid": True,
+            "exceed_quota": False,
         }
 
 
@@ -437,10 +599,7 @@ class SecureFileHandler:
     def write_file(path: str, data: str | bytes, permissions: int = 0o400) -> None:
         if isinstance(data, str):
             data = data.encode("utf-8")
-
-        with open(path, "wb") as f:
-            f.write(data)
-        os.chmod(path, permissions)
+        SecureFileHandler._atomic_write(path, data, permissions)
 
     @staticmethod
     @overload
@@ -458,27 +617,54 @@ class SecureFileHandler:
         return _data.decode("utf-8") if decode else _data
 
     @staticmethod
-    def write_env(env_path: str, key: str, value: str | bytes) -> None:
-        if isinstance(value, bytes):
-            value = base64.b64encode(value).decode("utf-8")
+    def write_env(env_path: str, values: dict[str, str | bytes], permissions: int = 0o600) -> None:
+        """Write all values to the .env file at once, replacing the previous content."""
+        lines = []
+        for key, value in values.items():
+            if isinstance(value, bytes):
+                value = base64.b64encode(value).decode("utf-8")
+            lines.append(f"{key}={value}\n")
 
-        load_dotenv(env_path)
-        set_key(env_path, key, value)
+        SecureFileHandler._atomic_write(env_path, "".join(lines).encode("utf-8"), permissions)
 
     @staticmethod
-    def read_env(key: str) -> str:
-        value = os.getenv(key)
-        if value is None:
-            raise SecurityError(
-                f"Missing required environment variable: {key}, please check your key files"
-            )
-        return value
+    def _atomic_write(path: str, data: bytes, permissions: int) -> None:
+        """Write a sibling file and rename it over the target, so a crash never leaves a partial file.
+
+        A stale tmp file from an earlier crash is removed first, the mode given to os.open only
+        applies to a newly created file.
+        """
+        tmp_path = path + ".tmp"
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, permissions)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+            os.fsync(fd)
+            mode = os.fstat(fd).st_mode & 0o777
+        finally:
+            os.close(fd)
+        if mode != permissions:  # umask may have masked the requested bits
+            os.chmod(tmp_path, permissions)
+        os.replace(tmp_path, path)
+
+
+@functools.lru_cache(maxsize=8)
+def _read_env_file(env_path: str, mtime_ns: int, inode: int, size: int) -> dict[str, str | None]:
+    """Parse the .env file, the stat fields in the key make a rewritten file parse again."""
+    from dotenv import dotenv_values
+
+    return dict(dotenv_values(env_path))
+
 
+def cleanup(sensitive_data: list[bytearray]) -> None:
+    """Zero out the buffers in place.
 
-def cleanup(sensitive_data: list[bytes]) -> None:
+    Only mutable buffers can be wiped, an immutable bytes object cannot be overwritten and copying
+    it just leaves one more copy in memory.
+    """
     for data in sensitive_data:
         length = len(data)
-        buffer = ctypes.create_string_buffer(length)
-        ctypes.memmove(ctypes.addressof(buffer), data, length)
-        ctypes.memset(ctypes.addressof(buffer), 0, length)
-        del buffer
+        ctypes.memset((ctypes.c_char * length).from_buffer(data), 0, length)